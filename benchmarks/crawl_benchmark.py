@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Runs the willhaben spider end to end against the mock server
+
+The mock server (see `mock_willhaben.py`) is started in its own process, the
+spider crawls all of its listings and stores them in a SQLite file (default)
+or the MySQL database. Items/sec and the most important Scrapy stats are
+printed at the end.
+
+Usage (from the repository root):
+    python benchmarks/crawl_benchmark.py --listings 1000 --concurrency 16
+    python benchmarks/crawl_benchmark.py --listings 1000 --latency 100 --error-rate 0.02
+    python benchmarks/crawl_benchmark.py --sink mysql    # MYSQL_* from the environment
+    MYSQL_HOST=localhost python benchmarks/crawl_benchmark.py --sink mysql   # outside of docker
+"""
+
+# default python packages
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from mock_willhaben import add_server_arguments
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PIPELINES = {
+    'sqlite': 'webscraper_for_sophie.pipelines.SqlitePipeline',
+    'mysql': 'webscraper_for_sophie.pipelines.WebscraperForSophiePipeline',
+}
+REPORTED_STATS = ['finish_reason', 'item_scraped_count',
+                  'response_received_count', 'downloader/request_count',
+                  'downloader/response_status_count/500', 'retry/count',
+                  'spider_exceptions/count']
+
+
+def start_mock_server(argv):
+    """ Starts the mock server in a new process and waits until it is ready.
+
+    The server prints its url once the port is bound. If it exits instead
+    (e.g. because the port is already in use), an error is raised.
+
+    Args:
+        argv (list): command line arguments for `mock_willhaben.py`
+
+    Returns:
+        tuple: the server process and its base url, e.g. "http://localhost:8000"
+    """
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, 'benchmarks',
+                                      'mock_willhaben.py')] + argv,
+        stdout=subprocess.PIPE, text=True)
+    ready_line = server.stdout.readline()
+    match = re.search(r'(http://[^/\s]+)/', ready_line)
+    if match is None:
+        server.kill()
+        raise RuntimeError("Mock server did not start (exit status {})".format(
+            server.wait()))
+    return server, match[1]
+
+
+def run_crawl(base_url, sink, concurrency, sqlite_path, log_level):
+    """ Runs the spider until it is finished and returns its stats. """
+    # imported here, the project settings are only found from the repo root
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, REPO_DIR)
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.setdict({
+        'ITEM_PIPELINES': {PIPELINES[sink]: 300},
+        'SQLITE_PATH': sqlite_path,
+        'DOWNLOAD_DELAY': 0,
+        'CONCURRENT_REQUESTS': concurrency,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': concurrency,
+        'LOG_LEVEL': log_level,
+        'TELNETCONSOLE_ENABLED': False,
+    }, priority='cmdline')
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler('willhaben')
+    process.crawl(crawler, base_url=base_url)
+    process.start()
+    return crawler.stats.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_server_arguments(parser)
+    parser.add_argument('--sink', choices=sorted(PIPELINES), default='sqlite',
+                        help="where the items are stored")
+    parser.add_argument('--sqlite-path', default='benchmark.sqlite3',
+                        help="database file of the sqlite sink (overwritten)")
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help="number of concurrent requests")
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+    server_argv = ['--host', args.host, '--port', str(args.port),
+                   '--listings', str(args.listings),
+                   '--latency', str(args.latency), '--jitter', str(args.jitter),
+                   '--error-rate', str(args.error_rate),
+                   '--broken-rate', str(args.broken_rate)]
+
+    if args.sink == 'sqlite' and os.path.exists(args.sqlite_path):
+        os.remove(args.sqlite_path)
+
+    server, base_url = start_mock_server(server_argv)
+    try:
+        stats = run_crawl(base_url, args.sink, args.concurrency,
+                          os.path.abspath(args.sqlite_path), args.log_level)
+    finally:
+        server.terminate()
+        server.wait()
+
+    elapsed = (stats['finish_time'] - stats['start_time']).total_seconds()
+    items = stats.get('item_scraped_count', 0)
+    print("{} of {} listings in {:.2f} s: {:.1f} items/sec".format(
+        items, args.listings, elapsed, items / elapsed))
+    for name in REPORTED_STATS:
+        print("  {}: {}".format(name, stats.get(name, 0)))
+    for name, value in sorted(stats.items()):
+        if name.startswith('extraction_errors/'):
+            print("  {}: {}".format(name, value))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measures the startup (import) time of the webscraper modules
+
+Each module is imported in a fresh interpreter started with
+`python -X importtime` and the cumulative import time is read from its output.
+The number of modules loaded by the import is recorded as well; unlike the
+timings it doesn't depend on the load of the machine. The results are
+appended to `import_time.csv`, one row per release and module, so
+regressions between releases are easy to spot.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py                  # label = git describe
+    python benchmarks/import_time.py --release v1.2.0
+"""
+
+# default python packages
+import argparse
+import csv
+import datetime
+import os
+import statistics
+import subprocess
+import sys
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(REPO_DIR, 'benchmarks', 'import_time.csv')
+CSV_HEADER = ['release', 'date', 'module', 'median_us', 'min_us', 'runs',
+              'loaded_modules']
+
+# modules which are loaded by `scrapy list`, `scrapy check` and `scrapy crawl`
+MODULES = [
+    'webscraper_for_sophie.settings',
+    'webscraper_for_sophie.items',
+    'webscraper_for_sophie.pipelines',
+    'webscraper_for_sophie.spiders.willhaben_spider',
+]
+
+
+def measure_import(module):
+    """ Returns the cumulative import time of `module` in microseconds.
+
+    Args:
+        module (string): dotted name of the module, e.g. "webscraper_for_sophie.items"
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    # lines look like: "import time:   self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise RuntimeError("No import time reported for " + module)
+
+
+def count_loaded_modules(module):
+    """ Returns the number of modules in `sys.modules` after importing `module` """
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, {}; print(len(sys.modules))'.format(module)],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return int(result.stdout)
+
+
+def git_release_label():
+    """ Returns the output of `git describe`, e.g. "v1.2.0-3-gabc1234" """
+    result = subprocess.run(['git', 'describe', '--tags', '--always'],
+                            cwd=REPO_DIR, capture_output=True, text=True)
+    return result.stdout.strip() or 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--release', default=None,
+                        help="label of the measured release (default: git describe)")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="number of fresh interpreters per module")
+    parser.add_argument('--no-save', action='store_true',
+                        help="only print the results")
+    args = parser.parse_args()
+
+    release = args.release or git_release_label()
+    date = datetime.date.today().strftime("%Y-%m-%d")
+    rows = []
+    for module in MODULES:
+        timings = [measure_import(module) for _ in range(args.runs)]
+        loaded_modules = count_loaded_modules(module)
+        rows.append([release, date, module, int(statistics.median(timings)),
+                     min(timings), args.runs, loaded_modules])
+        print("{:<50} median {:>8} us   min {:>8} us   {:>5} modules".format(
+            module, int(statistics.median(timings)), min(timings),
+            loaded_modules))
+
+    if not args.no_save:
+        write_header = not os.path.exists(RESULTS_FILE)
+        with open(RESULTS_FILE, 'a', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            if write_header:
+                writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
+        print("Results appended to " + RESULTS_FILE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Serves generated willhaben-like pages for load testing the spider
+
+The list pages contain the embedded JSON urls and the pagination button,
+the detail pages contain the `data-testid` elements which are parsed by
+`WillhabenSpider`. The content is generated from the listing number, so every
+run serves the same pages.
+
+Usage (from the repository root):
+    python benchmarks/mock_willhaben.py --listings 1000 --latency 50 --error-rate 0.01
+    scrapy crawl willhaben -a base_url=http://localhost:8000 -s DOWNLOAD_DELAY=0
+"""
+
+# default python packages
+import argparse
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+LIST_PATH = '/iad/immobilien/eigentumswohnung/steiermark/graz/'
+DETAIL_PATH = '/iad/immobilien/d/eigentumswohnung/steiermark/graz/'
+DETAIL_PATH_REGEX = re.escape(DETAIL_PATH) + r'wohnung-graz-(\d+)/$'
+ITEMS_PER_PAGE = 25
+DISTRICTS = ['Innere Stadt', 'St. Leonhard', 'Geidorf', 'Lend', 'Gries',
+             'Jakomini', 'Liebenau', 'St. Peter', 'Waltendorf', 'Ries']
+
+LIST_PAGE = """<!DOCTYPE html>
+<html><head><title>Eigentumswohnungen Graz</title></head>
+<body>
+<h1>{count} Eigentumswohnungen in Graz</h1>
+{pagination}
+<script id="__NEXT_DATA__" type="application/json">{{"advertSummaryList":[{adverts}]}}</script>
+</body></html>
+"""
+PAGINATION_BUTTON = ('<a data-testid="pagination-top-next-button" '
+                     'href="{}?page={}">Weiter</a>')
+ADVERT_JSON = ('{{"id":"{id}","url":"{url}",'
+               '"referenceImageUrl":"https://cache.willhaben.at/mmo/{id}.jpg"}}')
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head>
+<body>
+<script>window.dataLayer = [{{"ad_id": "{id}"}}];</script>
+<h1>{title}</h1>
+<span data-testid="contact-box-price-box-price-value">€ {price}</span>
+<div data-testid="ad-detail-teaser-attribute-0">{size} m²</div>
+<div data-testid="ad-detail-teaser-attribute-1">{rooms} Zimmer</div>
+<ul>
+<li data-testid="attribute-item">Nutzfläche: {size}m²</li>
+<li data-testid="attribute-item">Zimmer: {rooms}</li>
+</ul>
+<div data-testid="object-location-address">{address}</div>
+<span data-testid="ad-detail-ad-id">Willhaben-Code: {id}</span>
+<span data-testid="ad-detail-ad-edit-date">Zuletzt geändert: 01.01.2021, 12:00 Uhr</span>
+<article><p>{description}</p></article>
+</body></html>
+"""
+# detail page of a listing with a "changed layout", i.e. nothing can be parsed
+BROKEN_DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head>
+<body><div class="new-layout">{title}</div></body></html>
+"""
+
+
+def render_list_page(page, listings):
+    """ Returns the html of the list page with the number `page` (1-based) """
+    first_id = (page - 1) * ITEMS_PER_PAGE + 1
+    last_id = min(page * ITEMS_PER_PAGE, listings)
+    adverts = ",".join(
+        ADVERT_JSON.format(id=listing_id,
+                           url="{}wohnung-graz-{}/".format(DETAIL_PATH,
+                                                           listing_id))
+        for listing_id in range(first_id, last_id + 1))
+    pagination = ''
+    if last_id < listings:
+        pagination = PAGINATION_BUTTON.format(LIST_PATH, page + 1)
+    return LIST_PAGE.format(count=listings, pagination=pagination,
+                            adverts=adverts)
+
+
+def render_detail_page(listing_id, broken=False):
+    """ Returns the html of the detail page of a listing """
+    rand = random.Random(listing_id)
+    size = rand.randint(30, 150)
+    rooms = rand.randint(1, 5)
+    price = size * rand.randint(2500, 5500)
+    postal_code = 8010 + 10 * rand.randrange(len(DISTRICTS))
+    district = DISTRICTS[(postal_code - 8010) // 10]
+    title = "Schöne {}-Zimmer-Wohnung in {}".format(rooms, district)
+    if broken:
+        return BROKEN_DETAIL_PAGE.format(title=title)
+    description = "Provisionsfrei! " if rand.random() < 0.3 else ""
+    description += "Helle Wohnung mit Balkon. " * rand.randint(5, 50)
+    return DETAIL_PAGE.format(
+        id=listing_id, title=title,
+        price="{:,}".format(price).replace(',', '.'),
+        size=size, rooms=rooms,
+        address="{} Graz, {}, Musterstraße {}".format(
+            postal_code, district, rand.randint(1, 99)),
+        description=description)
+
+
+class MockWillhabenHandler(BaseHTTPRequestHandler):
+    """ Answers the requests of the spider (configured by `make_server`) """
+
+    listings = 100
+    latency = 0.0           # in seconds
+    jitter = 0.0            # in seconds
+    error_rate = 0.0        # fraction of responses with HTTP 500
+    broken_rate = 0.0       # fraction of detail pages with unknown layout
+
+    def do_GET(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if random.random() < self.error_rate:
+            self.send_page(500, "<html><body>Internal Server Error</body></html>")
+            return
+
+        url = urlparse(self.path)
+        detail_match = re.match(DETAIL_PATH_REGEX, url.path)
+        if url.path == LIST_PATH:
+            page = int(parse_qs(url.query).get('page', ['1'])[0])
+            self.send_page(200, render_list_page(page, self.listings))
+        elif detail_match and 0 < int(detail_match[1]) <= self.listings:
+            listing_id = int(detail_match[1])
+            # the same listings are broken in every run
+            broken = random.Random(-listing_id).random() < self.broken_rate
+            self.send_page(200, render_detail_page(listing_id, broken))
+        else:
+            self.send_page(404, "<html><body>Not Found</body></html>")
+
+    def send_page(self, status, html):
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """ Don't write a log line for every request. """
+
+
+def make_server(host='localhost', port=8000, listings=100, latency=0.0,
+                jitter=0.0, error_rate=0.0, broken_rate=0.0):
+    """ Returns a new (not yet started) mock server.
+
+    Args:
+        listings (int): total number of listings over all list pages
+        latency (float): delay of every response in seconds
+        jitter (float): additional random delay of up to `jitter` seconds
+        error_rate (float): fraction of responses which are HTTP 500 errors
+        broken_rate (float): fraction of detail pages without parsable fields
+    """
+    handler = type('ConfiguredHandler', (MockWillhabenHandler,), {
+        'listings': listings, 'latency': latency, 'jitter': jitter,
+        'error_rate': error_rate, 'broken_rate': broken_rate})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def add_server_arguments(parser):
+    """ Adds the mock server options to an argparse parser. """
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8000,
+                        help="0 picks a free port")
+    parser.add_argument('--listings', type=int, default=100,
+                        help="total number of listings")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="delay of every response in milliseconds")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="additional random delay in milliseconds")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="fraction of responses which are HTTP 500 errors")
+    parser.add_argument('--broken-rate', type=float, default=0.0,
+                        help="fraction of detail pages with unknown layout")
+
+
+def server_from_arguments(args):
+    """ Creates the mock server from the parsed `add_server_arguments` options """
+    return make_server(args.host, args.port, listings=args.listings,
+                       latency=args.latency / 1000, jitter=args.jitter / 1000,
+                       error_rate=args.error_rate, broken_rate=args.broken_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    server = server_from_arguments(args)
+    # the port is already bound, `crawl_benchmark.py` waits for this line
+    host, port = server.server_address[:2]
+    print("Serving {} listings on http://{}:{}{}".format(
+        args.listings, host, port, LIST_PATH), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,41 +1,69 @@
 # import default packages
 import logging
 import time
-# import installed packages
-import environs
-import mysql.connector
-from mysql.connector import errorcode
-# import project modules
-from webscraper_for_sophie.items import CondoItem
 
 
-env = environs.Env()
-USER = env("MYSQL_USER")
-PASSWORD = env("MYSQL_PASSWORD")
-DATABASE = env("MYSQL_DATABASE")
-TABLENAME = env("MYSQL_TABLENAME")
-HOST = 'db'     # name of the docker container
-
 # Settings for connection error handling
 NUM_ATTEMPTS = 30
 DELAY_BTW_ATTEMPTS = 1     # in seconds
 RETRY_MSG = ("Waiting for MySQL container to start gracefully " +
              "(Attempt {} of {}) failed")
 
+# Scrapy settings which are required to open a database connection
+REQUIRED_SETTINGS = ('MYSQL_USER', 'MYSQL_PASSWORD', 'MYSQL_DATABASE',
+                     'MYSQL_TABLENAME')
+
 
 class DatabaseManager():
     """
     Simplies our database operations
+
+    The connection parameters are taken from the Scrapy settings (see
+    `settings.py`) and checked by `from_settings`. The MySQL driver is only
+    imported when `connect` is called, so importing this module is cheap.
     """
 
+    def __init__(self, user, password, database, tablename, host='db'):
+        self.user = user
+        self.password = password
+        self.database = database
+        self.tablename = tablename
+        self.host = host
+        self.connection = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Create a new DatabaseManager from the Scrapy settings.
+
+        Args:
+            settings: the Scrapy `Settings` object of the running crawler.
+
+        Raises:
+            ValueError: if one of the `MYSQL_*` settings is missing.
+        """
+        missing = [name for name in REQUIRED_SETTINGS if not settings.get(name)]
+        if missing:
+            raise ValueError("Missing database settings: " +
+                             ", ".join(missing))
+        return cls(user=settings.get('MYSQL_USER'),
+                   password=settings.get('MYSQL_PASSWORD'),
+                   database=settings.get('MYSQL_DATABASE'),
+                   tablename=settings.get('MYSQL_TABLENAME'),
+                   host=settings.get('MYSQL_HOST', 'db'))
+
     def connect(self):
         """ Connect to the database """
+        # imported here to keep `scrapy list` and friends fast
+        import mysql.connector
+        from mysql.connector import errorcode
+
         for attempt_no in range(1, NUM_ATTEMPTS+1):
             try:
-                self.connection = mysql.connector.connect(host=HOST,
-                                                          database=DATABASE,
-                                                          user=USER,
-                                                          password=PASSWORD)
+                self.connection = mysql.connector.connect(
+                    host=self.host,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password)
                 self.cursor = self.connection.cursor()
                 logging.debug("Database connection opened")
                 return
@@ -62,11 +90,12 @@ class DatabaseManager():
         Returns:
             bool: True if connected. False otherwise        
         """
-        self.connection.is_connected()
+        return (self.connection is not None and
+                self.connection.is_connected())
 
     def prep_table(self):
         """ create a new table if the provided table name does not exist. """
-        sql_command = "SHOW TABLES LIKE '{0}'".format(TABLENAME)
+        sql_command = "SHOW TABLES LIKE '{0}'".format(self.tablename)
         self.cursor.execute(sql_command)
         result = self.cursor.fetchone()  # fetch will return a python tuple
         if result is None:
@@ -88,7 +117,7 @@ class DatabaseManager():
             title TEXT COLLATE utf8_bin,
             url TEXT COLLATE utf8_bin,
             edit_date VARCHAR(100) COLLATE utf8_bin,
-            address VARCHAR(100) COLLATE utf8_bin);""".format(TABLENAME)
+            address VARCHAR(100) COLLATE utf8_bin);""".format(self.tablename)
             self.cursor.execute(sql_command)
             self.connection.commit()
             logging.debug("New database table has been created")
@@ -108,7 +137,7 @@ class DatabaseManager():
                             discovery_date, title, url, edit_date, address)
 						VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 
                         %s, %s, %s, %s);
-						""".format(TABLENAME)
+						""".format(self.tablename)
 
         insert_tuple = (None, item['willhaben_code'], item['postal_code'],
                         item['district'], item['price'], item['commission_fee'],
@@ -0,0 +1,137 @@
+"""
+Collects the extraction errors of a crawl
+
+Instead of writing a log line for every missing or unparsable field, the
+errors are counted per field. Each kind of error (field and message) is
+logged for its first few occurrences and then only at growing counts
+(every 10th, 100th, 1000th, ...). A couple of example urls are kept for the
+summary, which is logged when the spider is closed.
+"""
+
+# import default packages
+import collections
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionErrorCollector():
+    """
+    Aggregates the extraction errors reported by the `CondoItem`s
+
+    Args:
+        log_limit (int): number of errors that are logged individually per
+            field and message. Afterwards only every 10th (from 10 on), 100th
+            (from 100 on), ... error is logged together with the total.
+        sample_size (int): number of example urls that are kept per field.
+        max_ratio (float): the crawl should be stopped if more than this
+            fraction of items is incomplete, i.e. misses a required field
+            after all parsing. 0 disables the check.
+        min_items (int): number of items that have to be parsed before
+            `max_ratio` is checked.
+        stats: optional Scrapy stats collector. The counters are mirrored to
+            the `extraction_errors/<field>` stats.
+    """
+
+    def __init__(self, log_limit=10, sample_size=5, max_ratio=0.0,
+                 min_items=50, stats=None):
+        self.log_limit = log_limit
+        self.sample_size = sample_size
+        self.max_ratio = max_ratio
+        self.min_items = min_items
+        self.stats = stats
+
+        self.item_count = 0
+        self.failed_item_count = 0
+        self.field_counts = collections.Counter()
+        self.message_counts = collections.defaultdict(collections.Counter)
+        self.sample_urls = collections.defaultdict(list)
+        self.suppressed = set()     # (field, message) with rate limited logging
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """ Create a new collector from the crawler settings and stats. """
+        settings = crawler.settings
+        return cls(log_limit=settings.getint('EXTRACTION_ERRORS_LOG_LIMIT', 10),
+                   sample_size=settings.getint(
+                       'EXTRACTION_ERRORS_SAMPLE_SIZE', 5),
+                   max_ratio=settings.getfloat(
+                       'EXTRACTION_ERRORS_MAX_RATIO', 0.0),
+                   min_items=settings.getint('EXTRACTION_ERRORS_MIN_ITEMS', 50),
+                   stats=crawler.stats)
+
+    def add_item(self, item):
+        """ Count the errors which were reported for a parsed item.
+
+        Args:
+            item: the `CondoItem` returned by the spider.
+        """
+        self.item_count += 1
+        errors = item.get_errors()
+        # errors which were fixed by a fallback parser don't make it fail
+        if item.get_missing_fields():
+            self.failed_item_count += 1
+        # a field can be reported more than once per page (e.g. by parse_size
+        # and parse_size_2), count only its most severe error
+        field_errors = {}
+        for field, message, level in errors:
+            if field not in field_errors or level > field_errors[field][1]:
+                field_errors[field] = (message, level)
+        for field, (message, level) in field_errors.items():
+            self.add_error(field, message, item['url'], level)
+
+    def add_error(self, field, message, url, level=logging.ERROR):
+        """ Count a single error and log it if it isn't rate limited.
+
+        Args:
+            field (string): name of the affected item field, e.g. "price"
+            message (string): short description, e.g. "element not found"
+            url (string): page on which the error occurred
+            level (int): logging level of the error
+        """
+        self.field_counts[field] += 1
+        self.message_counts[field][message] += 1
+        samples = self.sample_urls[field]
+        if len(samples) < self.sample_size and url not in samples:
+            samples.append(url)
+        if self.stats is not None:
+            self.stats.inc_value('extraction_errors/' + field)
+
+        count = self.message_counts[field][message]
+        if count <= self.log_limit:
+            logger.log(level, "%s: %s on page %s", field, message, url)
+        elif count >= 10 and count % 10 ** (len(str(count)) - 1) == 0:
+            # 10, 20, ..., 90, 100, 200, ..., 900, 1000, 2000, ...
+            logger.log(level, "%s: %s on page %s (%d times so far)",
+                       field, message, url, count)
+        elif (field, message) not in self.suppressed:
+            self.suppressed.add((field, message))
+            logger.warning("More than %d errors '%s: %s', only every 10th, "
+                           "100th, ... error is logged from now on",
+                           self.log_limit, field, message)
+
+    def threshold_exceeded(self):
+        """
+        Returns:
+            bool: True if too many items are incomplete and the crawl should be
+            stopped. False otherwise
+        """
+        if not self.max_ratio or self.item_count < self.min_items:
+            return False
+        return self.failed_item_count / self.item_count > self.max_ratio
+
+    def log_summary(self):
+        """ Log the error counters and example urls of every field. """
+        if not self.field_counts:
+            logger.info("No extraction errors in %d items", self.item_count)
+            return
+        lines = ["Extraction errors: {} of {} items incomplete".format(
+            self.failed_item_count, self.item_count)]
+        for field, count in self.field_counts.most_common():
+            lines.append("  {}: {}".format(field, count))
+            for message, message_count in self.message_counts[field].most_common():
+                lines.append("    {} x {}".format(message_count, message))
+            for url in self.sample_urls[field]:
+                lines.append("    e.g. " + url)
+        logger.warning("\n".join(lines))
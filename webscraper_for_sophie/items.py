@@ -35,6 +35,9 @@ class CondoItem(scrapy.Item):
     MIN_SIZE = 10
     MAX_SIZE = 250
 
+    # an item without these values is useless for the market research
+    REQUIRED_FIELDS = ('price', 'size', 'willhaben_code')
+
     def set_default_values(self):
         # init fields if needed
         # no init value needed for self['url'] and self['discovery_date']
@@ -51,6 +54,39 @@ class CondoItem(scrapy.Item):
         self['commission_fee'] = self.DEFAULT_VALUE_STRING
         self['price_per_m2'] = self.DEFAULT_VALUE_INT
 
+    def report_error(self, field, message, level=logging.ERROR):
+        """ Remember an extraction error of this item.
+
+        The errors are collected by the spider (see `extraction_errors.py`)
+        instead of being logged right away.
+
+        Args:
+            field (string): name of the affected field, e.g. "price"
+            message (string): short description, e.g. "element not found"
+            level (int): logging level, e.g. `logging.WARNING`
+        """
+        # underscore attributes are not treated as item fields by Scrapy
+        if not hasattr(self, '_errors'):
+            self._errors = []
+        self._errors.append((field, message, level))
+
+    def get_errors(self):
+        """
+        Returns:
+            list: (field, message, level) tuples of the reported errors
+        """
+        return getattr(self, '_errors', [])
+
+    def get_missing_fields(self):
+        """
+        Returns:
+            list: required fields which still have their default value after
+            parsing, i.e. neither the primary nor the fallback parser worked
+        """
+        return [field for field in self.REQUIRED_FIELDS
+                if self[field] in (self.DEFAULT_VALUE_INT,
+                                   self.DEFAULT_VALUE_STRING)]
+
     def calc_price_per_m2(self):
         """ Calculate the price per square meter. """
         if self['size']:
@@ -69,14 +105,13 @@ class CondoItem(scrapy.Item):
             try:
                 price_int = int(price_string)   # convert to int
             except ValueError:
-                logging.error("Could not convert price to int at page " +
-                              self['url'])
+                self.report_error('price', "could not convert to int")
             else:
                 # realisitic value check
                 if price_int > self.MIN_PRICE and price_int < self.MAX_PRICE:
                     self['price'] = price_int
                 else:
-                    logging.error("Unrealistic price at page " + self['url'])
+                    self.report_error('price', "unrealistic value")
 
     def parse_size(self, size_text):
         """ Parses the size from the input text.
@@ -90,16 +125,16 @@ class CondoItem(scrapy.Item):
             try:
                 size_int = int(size_string)  # convert to int
             except ValueError:
-                logging.error("Could not convert size to int at page " +
-                              self['url'])
+                self.report_error('size', "could not convert to int")
             else:
                 # realisitic value check
                 if size_int > self.MIN_SIZE and size_int < self.MAX_SIZE:
                     self['size'] = size_int
                 else:
-                    logging.warning("Unrealistic size at page " + self['url'])
+                    self.report_error('size', "unrealistic value",
+                                      logging.WARNING)
         else:
-            logging.error("size parsing failed on page " + self['url'])
+            self.report_error('size', "parsing failed")
 
     def parse_size_2(self, size_text):
         """ Parses the size from the input text if it contains a keyword
@@ -117,18 +152,15 @@ class CondoItem(scrapy.Item):
                 try:
                     size_int = int(size_string)  # convert to int
                 except ValueError:
-                    logging.error("Could not convert size to int at page " +
-                                  self['url'])
+                    self.report_error('size', "could not convert to int")
                 else:
                     # realisitic value check
                     if size_int > self.MIN_SIZE and size_int < self.MAX_SIZE:
                         self['size'] = size_int
                     else:
-                        logging.error(
-                            "Unrealistic size at page " + self['url'])
+                        self.report_error('size', "unrealistic value")
             else:
-                logging.error("secondary size parsing failed on page " +
-                              self['url'])
+                self.report_error('size', "secondary parsing failed")
 
     def parse_room_count(self, room_count_text):
         """ Parses the room_count from the input text.
@@ -142,11 +174,9 @@ class CondoItem(scrapy.Item):
             try:
                 self['room_count'] = int(room_count_string)
             except ValueError:
-                logging.error("Could not convert room_count to int at page " +
-                              self['url'])
+                self.report_error('room_count', "could not convert to int")
         else:
-            logging.warning(
-                "room_count parsing failed on page " + self['url'])
+            self.report_error('room_count', "parsing failed", logging.WARNING)
 
     def parse_room_count_2(self, room_count_text):
         """ Parses the room_count from the input text if it contains a keyword
@@ -165,8 +195,6 @@ class CondoItem(scrapy.Item):
                     self['room_count'] = int(
                         room_count_string)  # convert to int
                 except ValueError:
-                    logging.error("Could not convert room_count to int at page "
-                                  + self['url'])
+                    self.report_error('room_count', "could not convert to int")
             else:
-                logging.error("secondary room_count parsing failed on page " +
-                              self['url'])
+                self.report_error('room_count', "secondary parsing failed")
@@ -4,25 +4,91 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import os
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import NotConfigured
 
 from webscraper_for_sophie.database_manager import DatabaseManager
 
 
 class WebscraperForSophiePipeline:
 
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """ This method is used by Scrapy to create the pipeline.
+
+        The database settings are validated here, so a missing setting stops
+        `scrapy crawl` right away (`scrapy list` doesn't create pipelines).
+        The pipeline is disabled during `scrapy check`, contracts don't need
+        the database.
+        """
+        if os.environ.get('SCRAPY_CHECK'):
+            raise NotConfigured("No database during scrapy check")
+        return cls(DatabaseManager.from_settings(crawler.settings))
+
     def open_spider(self, spider):
         """ This method is called when the spider is opened. """
-        self.db_manager = DatabaseManager()
         self.db_manager.connect()
         self.db_manager.prep_table()
 
     def close_spider(self, spider):
         """ This method is called when the spider is closed. """
-        self.db_manager.close()
+        if self.db_manager.is_connected():
+            self.db_manager.close()
 
     def process_item(self, item, spider):
         """ This method is called for every item pipeline component. """
         self.db_manager.store_item(item)
         return item
+
+
+class SqlitePipeline:
+    """
+    Stores the items in a local SQLite file instead of the MySQL database
+
+    Useful for local runs and benchmarks without docker. Enable it with
+    `-s ITEM_PIPELINES='{"webscraper_for_sophie.pipelines.SqlitePipeline": 300}'`
+    """
+
+    COLUMNS = ('willhaben_code', 'postal_code', 'district', 'price',
+               'commission_fee', 'size', 'room_count', 'price_per_m2',
+               'discovery_date', 'title', 'url', 'edit_date', 'address')
+
+    def __init__(self, path, tablename):
+        self.path = path
+        self.tablename = tablename
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """ This method is used by Scrapy to create the pipeline. """
+        settings = crawler.settings
+        return cls(settings.get('SQLITE_PATH', 'webscraper.sqlite3'),
+                   settings.get('MYSQL_TABLENAME') or 'condos')
+
+    def open_spider(self, spider):
+        """ This method is called when the spider is opened. """
+        import sqlite3
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS {0} "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, {1})".format(
+                self.tablename, ", ".join(self.COLUMNS)))
+
+    def close_spider(self, spider):
+        """ This method is called when the spider is closed. """
+        self.connection.commit()
+        self.connection.close()
+
+    def process_item(self, item, spider):
+        """ This method is called for every item pipeline component. """
+        self.connection.execute(
+            "INSERT INTO {0} ({1}) VALUES ({2})".format(
+                self.tablename, ", ".join(self.COLUMNS),
+                ", ".join("?" * len(self.COLUMNS))),
+            tuple(item[column] for column in self.COLUMNS))
+        return item
@@ -7,6 +7,8 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+
 BOT_NAME = 'webscraper_for_sophie'
 
 SPIDER_MODULES = ['webscraper_for_sophie.spiders']
@@ -66,6 +68,31 @@ ITEM_PIPELINES = {
     'webscraper_for_sophie.pipelines.WebscraperForSophiePipeline': 300,
 }
 
+# Database connection used by the item pipeline (values from the .env file).
+# They are validated when the pipeline is created by `scrapy crawl`. Commands
+# like `scrapy list` or `scrapy check` don't use the database and work without.
+# Each one can be overridden on the command line, e.g. `-s MYSQL_HOST=localhost`
+MYSQL_HOST = os.environ.get('MYSQL_HOST', 'db')   # name of the docker container
+MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE')
+MYSQL_TABLENAME = os.environ.get('MYSQL_TABLENAME')
+MYSQL_USER = os.environ.get('MYSQL_USER')
+MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD')
+
+# File used by the SqlitePipeline (alternative to the MySQL database)
+SQLITE_PATH = 'webscraper.sqlite3'
+
+# Extraction errors (see extraction_errors.py)
+# Number of errors which are logged per field and message, afterwards only
+# every 10th, 100th, ... error is logged
+EXTRACTION_ERRORS_LOG_LIMIT = 10
+# Number of example urls per field in the summary at the end of the crawl
+EXTRACTION_ERRORS_SAMPLE_SIZE = 5
+# Stop the crawl if more than this fraction of items misses price, size or
+# willhaben_code (0 = never), but only after EXTRACTION_ERRORS_MIN_ITEMS items
+# have been parsed
+EXTRACTION_ERRORS_MAX_RATIO = 0.5
+EXTRACTION_ERRORS_MIN_ITEMS = 50
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
@@ -9,12 +9,12 @@ This class defines how the willhaben website will be crawled
 import datetime
 import re
 import logging
+from urllib.parse import urlparse
 # installed packages
 import scrapy
-from scrapy.spiders import CrawlSpider, Rule
-from scrapy.linkextractors import LinkExtractor
-from bs4 import BeautifulSoup
+from scrapy.exceptions import CloseSpider
 # project modules
+from webscraper_for_sophie.extraction_errors import ExtractionErrorCollector
 from webscraper_for_sophie.items import CondoItem
 
 
@@ -41,6 +41,32 @@ class WillhabenSpider(scrapy.Spider):
         START_URL
     ]
 
+    def __init__(self, base_url=None, *args, **kwargs):
+        """
+        Args:
+            base_url (string): crawl another host with the same page structure
+                instead of willhaben, e.g. the mock server in `benchmarks/`.
+                Use it like this: `scrapy crawl willhaben -a base_url=http://localhost:8000`
+        """
+        super().__init__(*args, **kwargs)
+        if base_url:
+            base_url = base_url.rstrip('/')
+            self.start_urls = [self.START_URL.replace(self.BASE_URL, base_url)]
+            self.allowed_domains = [urlparse(base_url).hostname]
+            self.BASE_URL = base_url
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        """ This method is used by Scrapy to create the spider. """
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.extraction_errors = ExtractionErrorCollector.from_crawler(
+            crawler)
+        return spider
+
+    def closed(self, reason):
+        """ This method is called when the spider is closed. """
+        self.extraction_errors.log_summary()
+
     def parse(self, response):
         """
         This is the default callback used by Scrapy to process downloaded
@@ -66,12 +92,15 @@ class WillhabenSpider(scrapy.Spider):
             yield scrapy.Request(full_item_url, self.parse_item)
 
         # get the next page of the list
+        from bs4 import BeautifulSoup  # deferred: only needed while crawling
         soup = BeautifulSoup(response.text, 'lxml')
         pagination_btn = soup.find(
             'a', attrs={"data-testid": "pagination-top-next-button"})
+        if pagination_btn is None:
+            logging.info("No next page button found on page " + response.url)
+            return
         next_page_url = self.BASE_URL + pagination_btn['href']
         yield scrapy.Request(next_page_url, self.parse)
-        # TODO error handling
 
     def parse_item(self, response):
         """returns/yields a :py:class:`WillhabenItem`.
@@ -84,6 +113,7 @@ class WillhabenSpider(scrapy.Spider):
         item['discovery_date'] = datetime.datetime.now().strftime("%Y-%m-%d")
         # time could also be added if needed: "%Y-%m-%d %H:%M:%S"
 
+        from bs4 import BeautifulSoup  # deferred: only needed while crawling
         soup = BeautifulSoup(response.text, 'lxml')
         # remove all script tags from soup
         for s in soup('script'):
@@ -94,7 +124,7 @@ class WillhabenSpider(scrapy.Spider):
         if title_tag:
             item['title'] = title_tag.get_text()
         else:
-            logging.error("title element not found on page " + item['url'])
+            item.report_error('title', "element not found")
 
         # price
         price_tag = soup.find(
@@ -103,7 +133,7 @@ class WillhabenSpider(scrapy.Spider):
             visible_price_text = price_tag.get_text()
             item.parse_price(visible_price_text)
         else:
-            logging.error("price element not found on page " + item['url'])
+            item.report_error('price', "element not found")
 
         # size
         size_tag = soup.find(
@@ -112,7 +142,7 @@ class WillhabenSpider(scrapy.Spider):
             visible_size_text = size_tag.get_text()
             item.parse_size(visible_size_text)
         else:
-            logging.error("size element not found on page " + item['url'])
+            item.report_error('size', "element not found")
 
         # room_count
         room_count_tag = soup.find(
@@ -121,8 +151,7 @@ class WillhabenSpider(scrapy.Spider):
             room_count_text = room_count_tag.get_text()
             item.parse_room_count(room_count_text)
         else:
-            logging.error(
-                "room_count element not found on page " + item['url'])
+            item.report_error('room_count', "element not found")
 
         # alternative size and room count parsing (from attributes)
         attribute_tags = soup.findAll(
@@ -137,8 +166,7 @@ class WillhabenSpider(scrapy.Spider):
                 if item['room_count'] == 0:
                     item.parse_room_count_2(attribute_text)
         else:
-            logging.error(
-                "attribute elements not found on page " + item['url'])
+            item.report_error('attributes', "elements not found")
 
         # address, postal_code and district
         location_address_tag = soup.find(
@@ -152,18 +180,15 @@ class WillhabenSpider(scrapy.Spider):
             if match:
                 item['postal_code'] = match[0]  # The entire match
             else:
-                logging.error(
-                    "postal_code parsing failed on page " + item['url'])
+                item.report_error('postal_code', "parsing failed")
             # parse district
             match = re.search(r'8\d\d\d ([^,]+)', location_address_text)
             if match:
                 item['district'] = match[1]  # The first group
             else:
-                logging.error(
-                    "district parsing failed on page " + item['url'])
+                item.report_error('district', "parsing failed")
         else:
-            logging.error("element for address, postal_code and district " +
-                          "not found on page " + item['url'])
+            item.report_error('address', "element not found")
 
         # willhaben_code
         willhaben_code_tag = soup.find(
@@ -174,11 +199,9 @@ class WillhabenSpider(scrapy.Spider):
             if match:
                 item['willhaben_code'] = match[0]  # The first group
             else:
-                logging.error(
-                    "willhaben_code parsing failed on page " + item['url'])
+                item.report_error('willhaben_code', "parsing failed")
         else:
-            logging.error(
-                "willhaben_code element not found on page " + item['url'])
+            item.report_error('willhaben_code', "element not found")
 
         # edit_date
         edit_date_tag = soup.find(
@@ -186,7 +209,7 @@ class WillhabenSpider(scrapy.Spider):
         if edit_date_tag:
             item['edit_date'] = edit_date_tag.get_text()
         else:
-            logging.error("edit_date element not found on page " + item['url'])
+            item.report_error('edit_date', "element not found")
 
         # commission_fee
         body_tag = soup.find('article')
@@ -197,11 +220,15 @@ class WillhabenSpider(scrapy.Spider):
             else:
                 item['commission_fee'] = 3.6
         else:
-            logging.error(
-                "commission_fee element not found on page " + item['url'])
+            item.report_error('commission_fee', "element not found")
 
         # price_per_m2
         item.calc_price_per_m2()
 
         # futher item processing is done in the item pipeline
+        self.extraction_errors.add_item(item)
         yield item
+
+        # give up if the parser seems to be broken
+        if self.extraction_errors.threshold_exceeded():
+            raise CloseSpider('extraction_errors')